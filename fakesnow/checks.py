@@ -31,15 +31,16 @@ def is_unqualified_table_expression(expression: exp.Expression) -> tuple[bool, b
     assert node.parent, f"No parent for table expression {node.sql()}"
 
     if (parent_kind := node.parent.args.get("kind")) and isinstance(parent_kind, str):
-        if parent_kind.upper() == "DATABASE":
+        parent_kind = parent_kind.upper()
+        if parent_kind == "DATABASE":
             # "CREATE/DROP DATABASE"
             no_database = False
             no_schema = False
-        elif parent_kind.upper() == "SCHEMA":
+        elif parent_kind == "SCHEMA":
             # "CREATE/DROP SCHEMA"
             no_database = not node.args.get("catalog")
             no_schema = False
-        elif parent_kind.upper() in {"TABLE", "VIEW"}:
+        elif parent_kind in {"TABLE", "VIEW"}:
             # "CREATE/DROP TABLE/VIEW"
             no_database = not node.args.get("catalog")
             no_schema = not node.args.get("db")
@@ -50,13 +51,13 @@ def is_unqualified_table_expression(expression: exp.Expression) -> tuple[bool, b
         node.parent.key == "use"
         and (parent_kind := node.parent.args.get("kind"))
         and isinstance(parent_kind, exp.Var)
-        and parent_kind.name
+        and (use_kind := parent_kind.name.upper())
     ):
-        if parent_kind.name.upper() == "DATABASE":
+        if use_kind == "DATABASE":
             # "USE DATABASE"
             no_database = False
             no_schema = False
-        elif parent_kind.name.upper() == "SCHEMA":
+        elif use_kind == "SCHEMA":
             # "USE SCHEMA"
             no_database = not node.args.get("db")
             no_schema = False
@@ -156,63 +156,59 @@ class FakeSnowflakeCursor:
 
     def _transform(self, expression: exp.Expression) -> exp.Expression:
         return (
-            expression.transform(transforms.upper_case_unquoted_identifiers)
-            .transform(transforms.update_variables, variables=self._conn.variables)
-            .transform(transforms.set_schema, current_database=self._conn.database)
-            .transform(transforms.create_database, db_path=self._conn.db_path)
-            .transform(transforms.extract_comment_on_table)
-            .transform(transforms.extract_comment_on_columns)
-            .transform(transforms.information_schema_fs_columns_snowflake)
-            .transform(transforms.information_schema_fs_tables_ext)
-            .transform(transforms.information_schema_fs_views)
-            .transform(transforms.drop_schema_cascade)
-            .transform(transforms.tag)
-            .transform(transforms.semi_structured_types)
-            .transform(transforms.try_parse_json)
-            .transform(transforms.split)
+            transforms.Pipeline(expression)
+            .apply(transforms.upper_case_unquoted_identifiers, exp.Identifier)
+            .apply(transforms.update_variables, (exp.Set, exp.Alias), variables=self._conn.variables)
+            .apply(transforms.set_schema, exp.Use, current_database=self._conn.database)
+            .apply(transforms.create_database, exp.Create, db_path=self._conn.db_path)
+            .apply(transforms.extract_comment_on_table, (exp.Create, exp.Comment, exp.Alter))
+            .apply(transforms.extract_comment_on_columns, exp.Alter)
+            .apply(transforms.information_schema_fs_columns_snowflake, exp.Table)
+            .apply(transforms.information_schema_fs_tables_ext, exp.Select)
+            .apply(transforms.information_schema_fs_views, exp.Select)
+            .apply(transforms.drop_schema_cascade, exp.Drop)
+            .apply(transforms.tag, (exp.Alter, exp.Command, exp.Create))
+            .apply(transforms.semi_structured_types, exp.DataType)
+            .apply(transforms.try_parse_json, "TRY_PARSE_JSON")
+            .apply(transforms.split, exp.Split)
             # NOTE: trim_cast_varchar must be before json_extract_cast_as_varchar
-            .transform(transforms.trim_cast_varchar)
+            .apply(transforms.trim_cast_varchar, exp.Trim)
             # indices_to_json_extract must be before regex_substr
-            .transform(transforms.indices_to_json_extract)
-            .transform(transforms.json_extract_cast_as_varchar)
-            .transform(transforms.json_extract_cased_as_varchar)
-            .transform(transforms.json_extract_precedence)
-            .transform(transforms.flatten_value_cast_as_varchar)
-            .transform(transforms.flatten)
-            .transform(transforms.regex_replace)
-            .transform(transforms.regex_substr)
-            .transform(transforms.values_columns)
-            .transform(transforms.to_date)
-            .transform(transforms.to_decimal)
-            .transform(transforms.try_to_decimal)
-            .transform(transforms.to_timestamp_ntz)
-            .transform(transforms.to_timestamp)
-            .transform(transforms.object_construct)
-            .transform(transforms.timestamp_ntz)
-            .transform(transforms.float_to_double)
-            .transform(transforms.integer_precision)
-            .transform(transforms.extract_text_length)
-            .transform(transforms.sample)
-            .transform(transforms.array_size)
-            .transform(transforms.random)
-            .transform(transforms.identifier)
-            .transform(transforms.array_agg_within_group)
-            .transform(transforms.array_agg)
-            .transform(transforms.dateadd_date_cast)
-            .transform(transforms.dateadd_string_literal_timestamp_cast)
-            .transform(transforms.datediff_string_literal_timestamp_cast)
-            .transform(lambda e: transforms.show_schemas(e, self._conn.database))
-            .transform(lambda e: transforms.show_objects_tables(e, self._conn.database))
-            # TODO collapse into a single show_keys function
-            .transform(lambda e: transforms.show_keys(e, self._conn.database, kind="PRIMARY"))
-            .transform(lambda e: transforms.show_keys(e, self._conn.database, kind="UNIQUE"))
-            .transform(lambda e: transforms.show_keys(e, self._conn.database, kind="FOREIGN"))
-            .transform(transforms.show_users)
-            .transform(transforms.create_user)
-            .transform(transforms.sha256)
-            .transform(transforms.create_clone)
-            .transform(transforms.alias_in_join)
-            .transform(transforms.alter_table_strip_cluster_by)
+            .apply(transforms.indices_to_json_extract, exp.Bracket)
+            .apply(transforms.json_extract_cast_as_varchar, exp.Cast)
+            .apply(transforms.json_extract_cased_as_varchar, (exp.Upper, exp.Lower))
+            .apply(transforms.json_extract_precedence, (exp.JSONExtract, exp.JSONExtractScalar))
+            .apply(transforms.flatten_value_cast_as_varchar, exp.Cast)
+            .apply(transforms.flatten, exp.Lateral)
+            .apply(transforms.regex_replace, exp.RegexpReplace)
+            .apply(transforms.regex_substr, exp.RegexpExtract)
+            .apply(transforms.values_columns, exp.Values)
+            .apply(transforms.to_date, "TO_DATE")
+            .apply(transforms.to_decimal, (exp.ToNumber, *transforms.TO_DECIMAL_FUNCTIONS))
+            .apply(transforms.try_to_decimal, transforms.TRY_TO_DECIMAL_FUNCTIONS)
+            .apply(transforms.to_timestamp_ntz, "TO_TIMESTAMP_NTZ")
+            .apply(transforms.to_timestamp, exp.UnixToTime)
+            .apply(transforms.object_construct, exp.Struct)
+            .apply(transforms.timestamp_ntz, exp.DataType)
+            .apply(transforms.float_to_double, exp.DataType)
+            .apply(transforms.integer_precision, exp.DataType)
+            .apply(transforms.extract_text_length, (exp.Create, exp.Alter))
+            .apply(transforms.sample, exp.TableSample)
+            .apply(transforms.array_size, exp.ArraySize)
+            .apply(transforms.random, exp.Rand)
+            .apply(transforms.identifier, "IDENTIFIER")
+            .apply(transforms.array_agg_within_group, exp.WithinGroup)
+            .apply(transforms.array_agg, exp.ArrayAgg)
+            .apply(transforms.dateadd_date_cast, exp.DateAdd)
+            .apply(transforms.dateadd_string_literal_timestamp_cast, exp.DateAdd)
+            .apply(transforms.datediff_string_literal_timestamp_cast, exp.DateDiff)
+            .apply(transforms.show, exp.Show, current_database=self._conn.database)
+            .apply(transforms.create_user, exp.Command)
+            .apply(transforms.sha256, (exp.SHA2, "SHA2_HEX", "SHA2_BINARY"))
+            .apply(transforms.create_clone, exp.Create)
+            .apply(transforms.alias_in_join, exp.Join)
+            .apply(transforms.alter_table_strip_cluster_by, exp.Alter)
+            .expression
         )
 
     def _transform_explode(self, expression: exp.Expression) -> list[exp.Expression]:
@@ -304,9 +300,10 @@ class FakeSnowflakeCursor:
         elif cmd in ("DESCRIBE TABLE", "DESCRIBE VIEW"):
             # DESCRIBE TABLE/VIEW has already been run above to detect and error if the table exists
             # We now rerun DESCRIBE TABLE/VIEW but transformed with columns to match Snowflake
-            result_sql = transformed.transform(
-                lambda e: transforms.describe_table(e, self._conn.database, self._conn.schema)
-            ).sql(dialect="duckdb")
+            # The Describe is always the root, so transform it directly rather than visiting every node
+            result_sql = transforms.describe_table(transformed, self._conn.database, self._conn.schema).sql(
+                dialect="duckdb"
+            )
 
         elif (eid := transformed.find(exp.Identifier, bfs=False)) and isinstance(eid.this, str):
             ident = eid.this if eid.quoted else eid.this.upper()
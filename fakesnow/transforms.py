@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import functools
+import re
+from collections.abc import Callable
 from pathlib import Path
 from string import Template
-from typing import ClassVar, Literal, cast
+from typing import Any, ClassVar, Literal, Union, cast
 
 import sqlglot
 from sqlglot import exp
@@ -12,7 +15,82 @@ from fakesnow.instance import USERS_TABLE_FQ_NAME
 from fakesnow.variables import Variables
 
 MISSING_DATABASE = "missing_database"
-SUCCESS_NOP = sqlglot.parse_one("SELECT 'Statement executed successfully.' as status")
+_INTEGER_TYPES = frozenset((exp.DataType.Type.INT, exp.DataType.Type.SMALLINT, exp.DataType.Type.TINYINT))
+_TEXT_TYPES = frozenset((exp.DataType.Type.VARCHAR, exp.DataType.Type.TEXT))
+_SEMI_STRUCTURED_TYPES = frozenset((exp.DataType.Type.ARRAY, exp.DataType.Type.OBJECT, exp.DataType.Type.VARIANT))
+
+# SELECT 'Statement executed successfully.' AS status, built directly rather than parsed
+SUCCESS_NOP = exp.Select(
+    expressions=[
+        exp.Alias(this=exp.Literal.string("Statement executed successfully."), alias=exp.to_identifier("status"))
+    ]
+)
+
+
+# a node type, or the upper-case name of an anonymous function
+Match = Union[type[exp.Expression], str]
+
+
+class Pipeline:
+    """Applies a sequence of transforms to an expression.
+
+    Each transform visits every node in the tree, but most only act on a few node types, or on anonymous functions
+    with a particular name. So we track the node types and anonymous function names present in the expression and skip
+    any transform that can't match. The expression is transformed in place, rather than copied for every transform.
+
+    Example:
+        >>> import sqlglot
+        >>> Pipeline(sqlglot.parse_one("select name from table1")).apply(
+        ...     upper_case_unquoted_identifiers, exp.Identifier
+        ... ).apply(to_date, "TO_DATE").expression.sql()
+        'SELECT NAME FROM TABLE1'
+    """
+
+    def __init__(self, expression: exp.Expression) -> None:
+        self.expression = expression
+        self._scan()
+
+    def apply(self, fn: Callable[..., exp.Expression], matches: Match | tuple[Match, ...], **kwargs: Any) -> Pipeline:
+        """Apply fn to every node, unless the expression has no nodes that match.
+
+        Args:
+            fn (Callable[..., exp.Expression]): the transform.
+            matches: the node types fn acts on, and/or the upper-case names of the anonymous functions it acts on.
+            kwargs: passed to fn.
+
+        Returns:
+            Pipeline: self, for chaining.
+        """
+        node_types, functions = _match_sets(matches)
+        if not (self._node_types.isdisjoint(node_types) and self._functions.isdisjoint(functions)):
+            self.expression = self.expression.transform(fn, copy=False, **kwargs)
+            # the transform may have added or removed nodes
+            self._scan()
+        return self
+
+    def _scan(self) -> None:
+        self._node_types: set[type[exp.Expression]] = set()
+        self._functions: set[str] = set()
+        for node in self.expression.walk():
+            self._node_types.add(type(node))
+            if isinstance(node, exp.Anonymous) and isinstance(node.this, str):
+                self._functions.add(node.this.upper())
+
+
+@functools.lru_cache
+def _match_sets(matches: Match | tuple[Match, ...]) -> tuple[frozenset[type[exp.Expression]], frozenset[str]]:
+    """Split matches into node types, including all their subclasses, and anonymous function names."""
+    todo = list(matches) if isinstance(matches, tuple) else [matches]
+    node_types = set()
+    functions = set()
+    while todo:
+        match = todo.pop()
+        if isinstance(match, str):
+            functions.add(match)
+        elif match not in node_types:
+            node_types.add(match)
+            todo.extend(match.__subclasses__())
+    return frozenset(node_types), frozenset(functions)
 
 
 def alias_in_join(expression: exp.Expression) -> exp.Expression:
@@ -44,7 +122,7 @@ def alter_table_strip_cluster_by(expression: exp.Expression) -> exp.Expression:
         and len(actions) == 1
         and (isinstance(actions[0], exp.Cluster))
     ):
-        return SUCCESS_NOP
+        return SUCCESS_NOP.copy()
     return expression
 
 
@@ -99,7 +177,7 @@ def create_clone(expression: exp.Expression) -> exp.Expression:
     if (
         isinstance(expression, exp.Create)
         and str(expression.args.get("kind")).upper() == "TABLE"
-        and (clone := expression.find(exp.Clone))
+        and (clone := expression.args.get("clone"))
     ):
         return exp.Create(
             this=expression.this,
@@ -130,8 +208,8 @@ def create_database(expression: exp.Expression, db_path: Path | None = None) ->
     """
 
     if isinstance(expression, exp.Create) and str(expression.args.get("kind")).upper() == "DATABASE":
-        ident = expression.find(exp.Identifier)
-        assert ident, f"No identifier in {expression.sql}"
+        ident = expression.this.this
+        assert isinstance(ident, exp.Identifier), f"No identifier in {expression.sql}"
         db_name = ident.this
         db_file = f"{db_path/db_name}.db" if db_path else ":memory:"
 
@@ -193,6 +271,12 @@ FROM (DESCRIBE information_schema.${view})
 )
 
 
+@functools.lru_cache
+def _parse(sql: str) -> exp.Expression:
+    """Parse duckdb sql once, for statements that are the same every time. Copy the result before changing it."""
+    return sqlglot.parse_one(sql, read="duckdb")
+
+
 def describe_table(
     expression: exp.Expression, current_database: str | None = None, current_schema: str | None = None
 ) -> exp.Expression:
@@ -206,19 +290,33 @@ def describe_table(
         and (kind := expression.args.get("kind"))
         and isinstance(kind, str)
         and kind.upper() in ("TABLE", "VIEW")
-        and (table := expression.find(exp.Table))
+        and isinstance(table := expression.this, exp.Table)
     ):
         catalog = table.catalog or current_database
         schema = table.db or current_schema
 
         if schema and schema.upper() == "INFORMATION_SCHEMA":
             # information schema views don't exist in _fs_columns_snowflake
-            return sqlglot.parse_one(SQL_DESCRIBE_INFO_SCHEMA.substitute(view=table.name), read="duckdb")
+            new = _parse(SQL_DESCRIBE_INFO_SCHEMA.substitute(view="view")).copy()
+            describe = new.find(exp.Describe)
+            assert describe, f"No describe in {new.sql()}"
+            describe.this.set("this", exp.to_identifier(table.name))
+            return new
 
-        return sqlglot.parse_one(
-            SQL_DESCRIBE_TABLE.substitute(catalog=catalog, schema=schema, table=table.name),
-            read="duckdb",
-        )
+        new = _parse(
+            SQL_DESCRIBE_TABLE.substitute(catalog="__fs_catalog__", schema="__fs_schema__", table="__fs_table__")
+        ).copy()
+        # replace the placeholder literals in the cached template with this table's values
+        values = {"__fs_catalog__": catalog or "", "__fs_schema__": schema or "", "__fs_table__": table.name}
+        placeholders = [
+            literal
+            for literal in new.args["where"].find_all(exp.Literal)
+            if literal.is_string and literal.this in values
+        ]
+        assert len(placeholders) == len(values), f"Expected placeholders {list(values)} in {new.sql()}"
+        for literal in placeholders:
+            literal.set("this", values[literal.this])
+        return new
 
     return expression
 
@@ -248,9 +346,8 @@ def drop_schema_cascade(expression: exp.Expression) -> exp.Expression:
     ):
         return expression
 
-    new = expression.copy()
-    new.args["cascade"] = True
-    return new
+    expression.args["cascade"] = True
+    return expression
 
 
 def dateadd_date_cast(expression: exp.Expression) -> exp.Expression:
@@ -266,28 +363,20 @@ def dateadd_date_cast(expression: exp.Expression) -> exp.Expression:
             D: 2023-03-06 00:00:00 (TIMESTAMP)
     """
 
-    if not isinstance(expression, exp.DateAdd):
-        return expression
-
-    if expression.unit is None:
-        return expression
-
-    if not isinstance(expression.unit.this, str):
-        return expression
-
-    if (unit := expression.unit.this.upper()) and unit.upper() not in {"DAY", "WEEK", "MONTH", "YEAR"}:
-        return expression
-
-    if not isinstance(expression.this, exp.Cast):
-        return expression
-
-    if expression.this.to.this != exp.DataType.Type.DATE:
-        return expression
+    if (
+        isinstance(expression, exp.DateAdd)
+        and (unit := expression.unit)
+        and isinstance(unit.this, str)
+        and unit.this.upper() in {"DAY", "WEEK", "MONTH", "YEAR"}
+        and isinstance(expression.this, exp.Cast)
+        and expression.this.to.this == exp.DataType.Type.DATE
+    ):
+        return exp.Cast(
+            this=expression,
+            to=exp.DataType(this=exp.DataType.Type.DATE, nested=False, prefix=False),
+        )
 
-    return exp.Cast(
-        this=expression,
-        to=exp.DataType(this=exp.DataType.Type.DATE, nested=False, prefix=False),
-    )
+    return expression
 
 
 def dateadd_string_literal_timestamp_cast(expression: exp.Expression) -> exp.Expression:
@@ -300,8 +389,7 @@ def dateadd_string_literal_timestamp_cast(expression: exp.Expression) -> exp.Exp
     if not isinstance(expression.this, exp.Literal) or not expression.this.is_string:
         return expression
 
-    new_dateadd = expression.copy()
-    new_dateadd.set(
+    expression.set(
         "this",
         exp.Cast(
             this=expression.this,
@@ -310,7 +398,7 @@ def dateadd_string_literal_timestamp_cast(expression: exp.Expression) -> exp.Exp
         ),
     )
 
-    return new_dateadd
+    return expression
 
 
 def datediff_string_literal_timestamp_cast(expression: exp.Expression) -> exp.Expression:
@@ -321,28 +409,18 @@ def datediff_string_literal_timestamp_cast(expression: exp.Expression) -> exp.Ex
     if not isinstance(expression, exp.DateDiff):
         return expression
 
-    op1 = expression.this.copy()
-    op2 = expression.expression.copy()
-
-    if isinstance(op1, exp.Literal) and op1.is_string:
-        op1 = exp.Cast(
-            this=op1,
-            # TODO: support TIMESTAMP_TYPE_MAPPING of TIMESTAMP_LTZ/TZ
-            to=exp.DataType(this=exp.DataType.Type.TIMESTAMP, nested=False, prefix=False),
-        )
-
-    if isinstance(op2, exp.Literal) and op2.is_string:
-        op2 = exp.Cast(
-            this=op2,
-            # TODO: support TIMESTAMP_TYPE_MAPPING of TIMESTAMP_LTZ/TZ
-            to=exp.DataType(this=exp.DataType.Type.TIMESTAMP, nested=False, prefix=False),
-        )
-
-    new_datediff = expression.copy()
-    new_datediff.set("this", op1)
-    new_datediff.set("expression", op2)
+    for arg in ("this", "expression"):
+        if isinstance(op := expression.args.get(arg), exp.Literal) and op.is_string:
+            expression.set(
+                arg,
+                exp.Cast(
+                    this=op,
+                    # TODO: support TIMESTAMP_TYPE_MAPPING of TIMESTAMP_LTZ/TZ
+                    to=exp.DataType(this=exp.DataType.Type.TIMESTAMP, nested=False, prefix=False),
+                ),
+            )
 
-    return new_datediff
+    return expression
 
 
 def extract_comment_on_columns(expression: exp.Expression) -> exp.Expression:
@@ -398,11 +476,9 @@ def extract_comment_on_table(expression: exp.Expression) -> exp.Expression:
                 else:
                     other_props.append(p)
 
-            new = expression.copy()
-            new_props: exp.Properties = new.args["properties"]
-            new_props.set("expressions", other_props)
-            new.args["table_comment"] = (table, comment)
-            return new
+            props.set("expressions", other_props)
+            expression.args["table_comment"] = (table, comment)
+            return expression
     elif (
         isinstance(expression, exp.Comment)
         and (cexp := expression.args.get("expression"))
@@ -448,9 +524,7 @@ def extract_text_length(expression: exp.Expression) -> exp.Expression:
             # alter table
             expressions = expression.args.get("actions") or []
         for e in expressions:
-            if dts := [
-                dt for dt in e.find_all(exp.DataType) if dt.this in (exp.DataType.Type.VARCHAR, exp.DataType.Type.TEXT)
-            ]:
+            if dts := [dt for dt in e.find_all(exp.DataType) if dt.this in _TEXT_TYPES]:
                 col_name = e.alias if isinstance(e, exp.Alias) else e.name
                 if len(dts) == 1 and (dt_size := dts[0].find(exp.DataTypeParam)):
                     size = (
@@ -527,7 +601,7 @@ def flatten_value_cast_as_varchar(expression: exp.Expression) -> exp.Expression:
         isinstance(expression, exp.Cast)
         and isinstance(expression.this, exp.Column)
         and expression.this.name.upper() == "VALUE"
-        and expression.to.this in [exp.DataType.Type.VARCHAR, exp.DataType.Type.TEXT]
+        and expression.to.this in _TEXT_TYPES
         and (select := expression.find_ancestor(exp.Select))
         and select.find(exp.Explode)
     ):
@@ -584,13 +658,11 @@ def indices_to_json_extract(expression: exp.Expression) -> exp.Expression:
         and (index := expression.expressions[0])
         and isinstance(index, exp.Literal)
         and index.this
+        and (index.is_string or index.is_int)
     ):
-        if index.is_string:
-            return exp.JSONExtract(this=expression.this, expression=exp.Literal(this=f"$.{index.this}", is_string=True))
-        else:
-            return exp.JSONExtract(
-                this=expression.this, expression=exp.Literal(this=f"$[{index.this}]", is_string=True)
-            )
+        # build the path structurally, so keys are quoted if needed (eg: v['a.b'] is the key "a.b" not a nested path)
+        part = exp.JSONPathKey(this=index.this) if index.is_string else exp.JSONPathSubscript(this=int(index.this))
+        return exp.JSONExtract(this=expression.this, expression=exp.JSONPath(expressions=[exp.JSONPathRoot(), part]))
 
     return expression
 
@@ -603,10 +675,10 @@ def information_schema_fs_columns_snowflake(expression: exp.Expression) -> exp.E
 
     if (
         isinstance(expression, exp.Table)
-        and expression.db
-        and expression.db.upper() == "INFORMATION_SCHEMA"
-        and expression.name
-        and expression.name.upper() == "COLUMNS"
+        and (db := expression.db)
+        and db.upper() == "INFORMATION_SCHEMA"
+        and (name := expression.name)
+        and name.upper() == "COLUMNS"
     ):
         expression.set("this", exp.Identifier(this="_FS_COLUMNS_SNOWFLAKE", quoted=False))
 
@@ -618,7 +690,8 @@ def information_schema_fs_tables_ext(expression: exp.Expression) -> exp.Expressi
 
     if (
         isinstance(expression, exp.Select)
-        and (tbl_exp := expression.find(exp.Table))
+        and (from_ := expression.args.get("from"))
+        and isinstance(tbl_exp := from_.this, exp.Table)
         and tbl_exp.name.upper() == "TABLES"
         and tbl_exp.db.upper() == "INFORMATION_SCHEMA"
     ):
@@ -642,7 +715,8 @@ def information_schema_fs_views(expression: exp.Expression) -> exp.Expression:
 
     if (
         isinstance(expression, exp.Select)
-        and (tbl_exp := expression.find(exp.Table))
+        and (from_ := expression.args.get("from"))
+        and isinstance(tbl_exp := from_.this, exp.Table)
         and tbl_exp.name.upper() == "VIEWS"
         and tbl_exp.db.upper() == "INFORMATION_SCHEMA"
     ):
@@ -660,7 +734,7 @@ def integer_precision(expression: exp.Expression) -> exp.Expression:
     if (
         isinstance(expression, exp.DataType)
         and (expression.this == exp.DataType.Type.DECIMAL and not expression.expressions)
-    ) or expression.this in (exp.DataType.Type.INT, exp.DataType.Type.SMALLINT, exp.DataType.Type.TINYINT):
+    ) or expression.this in _INTEGER_TYPES:
         return exp.DataType(
             this=exp.DataType.Type.BIGINT,
             nested=False,
@@ -772,26 +846,14 @@ def object_construct(expression: exp.Expression) -> exp.Expression:
     """
 
     if isinstance(expression, exp.Struct):
-        non_null_expressions = []
-        for e in expression.expressions:
-            if not (isinstance(e, exp.PropertyEQ)):
-                non_null_expressions.append(e)
-                continue
-
-            left = e.left
-            right = e.right
+        non_null_expressions = [
+            e
+            for e in expression.expressions
+            if not (isinstance(e, exp.PropertyEQ) and (isinstance(e.left, exp.Null) or isinstance(e.right, exp.Null)))
+        ]
 
-            left_is_null = isinstance(left, exp.Null)
-            right_is_null = isinstance(right, exp.Null)
-
-            if left_is_null or right_is_null:
-                continue
-
-            non_null_expressions.append(e)
-
-        new_struct = expression.copy()
-        new_struct.set("expressions", non_null_expressions)
-        return exp.Anonymous(this="TO_JSON", expressions=[new_struct])
+        expression.set("expressions", non_null_expressions)
+        return exp.Anonymous(this="TO_JSON", expressions=[expression])
 
     return expression
 
@@ -808,16 +870,15 @@ def regex_replace(expression: exp.Expression) -> exp.Expression:
 
         # pattern: snowflake requires escaping backslashes in single-quoted string constants, but duckdb doesn't
         # see https://docs.snowflake.com/en/sql-reference/functions-regexp#label-regexp-escape-character-caveats
-        expression.args["expression"] = exp.Literal(
-            this=expression.expression.this.replace("\\\\", "\\"), is_string=True
-        )
+        pattern = expression.expression
+        pattern.args["this"] = pattern.this.replace("\\\\", "\\")
 
         if not expression.args.get("replacement"):
             # if no replacement string, the snowflake default is ''
-            expression.args["replacement"] = exp.Literal(this="", is_string=True)
+            expression.set("replacement", exp.Literal(this="", is_string=True))
 
         # snowflake regex replacements are global
-        expression.args["modifiers"] = exp.Literal(this="g", is_string=True)
+        expression.set("modifiers", exp.Literal(this="g", is_string=True))
 
     return expression
 
@@ -904,12 +965,11 @@ def set_schema(expression: exp.Expression, current_database: str | None) -> exp.
         isinstance(expression, exp.Use)
         and (kind := expression.args.get("kind"))
         and isinstance(kind, exp.Var)
-        and kind.name
-        and kind.name.upper() in ["SCHEMA", "DATABASE"]
+        and (kind_name := kind.name.upper()) in ["SCHEMA", "DATABASE"]
     ):
         assert expression.this, f"No identifier for USE expression {expression}"
 
-        if kind.name.upper() == "DATABASE":
+        if kind_name == "DATABASE":
             # duckdb's default schema is main
             database = expression.this.name
             return exp.Command(
@@ -931,6 +991,18 @@ def set_schema(expression: exp.Expression, current_database: str | None) -> exp.
     return expression
 
 
+SQL_SHOW_OBJECTS_TERSE_COLUMNS = ", ".join(
+    [
+        "to_timestamp(0)::timestamptz as 'created_on'",
+        "table_name as 'name'",
+        "case when table_type='BASE TABLE' then 'TABLE' else table_type end as 'kind'",
+        "table_catalog as 'database_name'",
+        "table_schema as 'schema_name'",
+    ]
+)
+SQL_SHOW_OBJECTS_COLUMNS = SQL_SHOW_OBJECTS_TERSE_COLUMNS + ', null as "comment"'
+
+
 def show_objects_tables(expression: exp.Expression, current_database: str | None = None) -> exp.Expression:
     """Transform SHOW OBJECTS/TABLES to a query against the information_schema.tables table.
 
@@ -946,7 +1018,7 @@ def show_objects_tables(expression: exp.Expression, current_database: str | None
         return expression
 
     scope_kind = expression.args.get("scope_kind")
-    table = expression.find(exp.Table)
+    table = expression.args.get("scope")
 
     if scope_kind == "DATABASE":
         catalog = (table and table.name) or current_database
@@ -961,31 +1033,34 @@ def show_objects_tables(expression: exp.Expression, current_database: str | None
 
     tables_only = "table_type = 'BASE TABLE' and " if show == "TABLES" else ""
     exclude_fakesnow_tables = "not (table_schema == 'information_schema' and table_name like '_fs_%%')"
-    # without a database will show everything in the "account"
-    table_catalog = f" and table_catalog = '{catalog}'" if catalog else ""
-    schema = f" and table_schema = '{schema}'" if schema else ""
-    limit = limit.sql() if (limit := expression.args.get("limit")) and isinstance(limit, exp.Expression) else ""
 
-    columns = [
-        "to_timestamp(0)::timestamptz as 'created_on'",
-        "table_name as 'name'",
-        "case when table_type='BASE TABLE' then 'TABLE' else table_type end as 'kind'",
-        "table_catalog as 'database_name'",
-        "table_schema as 'schema_name'",
-    ]
+    columns_str = SQL_SHOW_OBJECTS_TERSE_COLUMNS if expression.args["terse"] else SQL_SHOW_OBJECTS_COLUMNS
 
-    terse = expression.args["terse"]
-    if not terse:
-        columns.append('null as "comment"')
+    query = f"SELECT {columns_str} from information_schema.tables where {tables_only}{exclude_fakesnow_tables}"
+    select = cast(exp.Select, _parse(query).copy())
 
-    columns_str = ", ".join(columns)
+    # without a database will show everything in the "account"
+    if catalog:
+        _and_where(select, "table_catalog", catalog)
+    if schema:
+        _and_where(select, "table_schema", schema)
+    if (limit := expression.args.get("limit")) and isinstance(limit, exp.Expression):
+        select.set("limit", limit.copy())
 
-    query = (
-        f"SELECT {columns_str} from information_schema.tables "
-        f"where {tables_only}{exclude_fakesnow_tables}{table_catalog}{schema}{limit}"
-    )
+    return select
+
+
+def _and_where(select: exp.Select, column: str, value: str) -> None:
+    """Append "AND column = 'value'" to the select's where clause.
 
-    return sqlglot.parse_one(query, read="duckdb")
+    A top-level OR (or other connector) in the existing condition is parenthesised so the new condition applies to
+    all of it. A top-level AND is left as-is, because adding parentheses there wouldn't change which rows match.
+    """
+    where = select.args["where"]
+    condition = where.this
+    if isinstance(condition, exp.Connector) and not isinstance(condition, exp.And):
+        condition = exp.paren(condition, copy=False)
+    where.set("this", exp.And(this=condition, expression=exp.column(column).eq(exp.Literal.string(value))))
 
 
 SQL_SHOW_SCHEMAS = """
@@ -1006,14 +1081,13 @@ def show_schemas(expression: exp.Expression, current_database: str | None = None
     See https://docs.snowflake.com/en/sql-reference/sql/show-schemas
     """
     if isinstance(expression, exp.Show) and isinstance(expression.this, str) and expression.this.upper() == "SCHEMAS":
-        if (ident := expression.find(exp.Identifier)) and isinstance(ident.this, str):
-            database = ident.this
-        else:
-            database = current_database
+        scope = expression.args.get("scope")
+        database = scope.name if isinstance(scope, exp.Table) else current_database
 
-        return sqlglot.parse_one(
-            f"{SQL_SHOW_SCHEMAS} and catalog_name = '{database}'" if database else SQL_SHOW_SCHEMAS, read="duckdb"
-        )
+        select = cast(exp.Select, _parse(SQL_SHOW_SCHEMAS).copy())
+        if database:
+            _and_where(select, "catalog_name", database)
+        return select
 
     return expression
 
@@ -1047,22 +1121,22 @@ def tag(expression: exp.Expression) -> exp.Expression:
     if isinstance(expression, exp.Alter) and (actions := expression.args.get("actions")):
         for a in actions:
             if isinstance(a, exp.AlterSet) and a.args.get("tag"):
-                return SUCCESS_NOP
+                return SUCCESS_NOP.copy()
     elif (
         isinstance(expression, exp.Command)
         and (cexp := expression.args.get("expression"))
         and isinstance(cexp, str)
-        and "SET TAG" in cexp.upper()
+        and re.search(r"SET\s+TAG", cexp, re.IGNORECASE)
     ):
         # alter table modify column set tag
-        return SUCCESS_NOP
+        return SUCCESS_NOP.copy()
     elif (
         isinstance(expression, exp.Create)
         and (kind := expression.args.get("kind"))
         and isinstance(kind, str)
         and kind.upper() == "TAG"
     ):
-        return SUCCESS_NOP
+        return SUCCESS_NOP.copy()
 
     return expression
 
@@ -1095,6 +1169,11 @@ def to_date(expression: exp.Expression) -> exp.Expression:
     return expression
 
 
+# anonymous functions handled by to_decimal and try_to_decimal
+TO_DECIMAL_FUNCTIONS = ("TO_DECIMAL", "TO_NUMERIC")
+TRY_TO_DECIMAL_FUNCTIONS = ("TRY_TO_DECIMAL", "TRY_TO_NUMBER", "TRY_TO_NUMERIC")
+
+
 def _get_to_number_args(e: exp.ToNumber) -> tuple[exp.Expression | None, exp.Expression | None, exp.Expression | None]:
     arg_format = e.args.get("format")
     arg_precision = e.args.get("precision")
@@ -1178,7 +1257,7 @@ def to_decimal(expression: exp.Expression) -> exp.Expression:
     if (
         isinstance(expression, exp.Anonymous)
         and isinstance(expression.this, str)
-        and expression.this.upper() in ["TO_DECIMAL", "TO_NUMERIC"]
+        and expression.this.upper() in TO_DECIMAL_FUNCTIONS
     ):
         return _to_decimal(expression, exp.Cast)
 
@@ -1193,7 +1272,7 @@ def try_to_decimal(expression: exp.Expression) -> exp.Expression:
     if (
         isinstance(expression, exp.Anonymous)
         and isinstance(expression.this, str)
-        and expression.this.upper() in ["TRY_TO_DECIMAL", "TRY_TO_NUMBER", "TRY_TO_NUMERIC"]
+        and expression.this.upper() in TRY_TO_DECIMAL_FUNCTIONS
     ):
         return _to_decimal(expression, exp.TryCast)
 
@@ -1251,12 +1330,16 @@ def trim_cast_varchar(expression: exp.Expression) -> exp.Expression:
         return expression
 
     operand = expression.this
-    if isinstance(operand, exp.Cast) and operand.to.this in [exp.DataType.Type.VARCHAR, exp.DataType.Type.TEXT]:
+    if (isinstance(operand, exp.Cast) and operand.to.this in _TEXT_TYPES) or (
+        isinstance(operand, exp.Literal) and operand.is_string
+    ):
         return expression
 
-    return exp.Trim(
-        this=exp.Cast(this=operand, to=exp.DataType(this=exp.DataType.Type.VARCHAR, nested=False, prefix=False))
+    # set on the Trim, rather than building a new one, to keep any characters to trim
+    expression.set(
+        "this", exp.Cast(this=operand, to=exp.DataType(this=exp.DataType.Type.VARCHAR, nested=False, prefix=False))
     )
+    return expression
 
 
 def try_parse_json(expression: exp.Expression) -> exp.Expression:
@@ -1301,14 +1384,9 @@ def semi_structured_types(expression: exp.Expression) -> exp.Expression:
         exp.Expression: The transformed expression.
     """
 
-    if isinstance(expression, exp.DataType) and expression.this in [
-        exp.DataType.Type.ARRAY,
-        exp.DataType.Type.OBJECT,
-        exp.DataType.Type.VARIANT,
-    ]:
-        new = expression.copy()
-        new.args["this"] = exp.DataType.Type.JSON
-        return new
+    if isinstance(expression, exp.DataType) and expression.this in _SEMI_STRUCTURED_TYPES:
+        expression.args["this"] = exp.DataType.Type.JSON
+        return expression
 
     return expression
 
@@ -1331,9 +1409,8 @@ def upper_case_unquoted_identifiers(expression: exp.Expression) -> exp.Expressio
     """
 
     if isinstance(expression, exp.Identifier) and not expression.quoted and isinstance(expression.this, str):
-        new = expression.copy()
-        new.set("this", expression.this.upper())
-        return new
+        expression.set("this", expression.this.upper())
+        return expression
 
     return expression
 
@@ -1358,13 +1435,15 @@ def values_columns(expression: exp.Expression) -> exp.Expression:
     return expression
 
 
-def show_users(expression: exp.Expression) -> exp.Expression:
+def show_users(expression: exp.Expression, current_database: str | None = None) -> exp.Expression:
     """Transform SHOW USERS to a query against the global database's information_schema._fs_users table.
 
+    Users are account-wide, so current_database is unused. It's accepted so all the SHOW transforms share a signature.
+
     https://docs.snowflake.com/en/sql-reference/sql/show-users
     """
     if isinstance(expression, exp.Show) and isinstance(expression.this, str) and expression.this.upper() == "USERS":
-        return sqlglot.parse_one(f"SELECT * FROM {USERS_TABLE_FQ_NAME}", read="duckdb")
+        return _parse(f"SELECT * FROM {USERS_TABLE_FQ_NAME}").copy()
 
     return expression
 
@@ -1378,36 +1457,35 @@ def create_user(expression: exp.Expression) -> exp.Expression:
     #      sqlglot doesnt yet support Create for snowflake.
     if isinstance(expression, exp.Command) and expression.this == "CREATE":
         sub_exp = expression.expression.strip()
-        if sub_exp.upper().startswith("USER"):
-            _, name, *ignored = sub_exp.split(" ")
-            if ignored:
+        if match := re.match(r"USER\s+(\S+)(.*)", sub_exp, re.IGNORECASE | re.DOTALL):
+            name, rest = match.groups()
+            if ignored := rest.split():
                 raise NotImplementedError(f"`CREATE USER` with {ignored} not yet supported")
             return sqlglot.parse_one(f"INSERT INTO {USERS_TABLE_FQ_NAME} (name) VALUES ('{name}')", read="duckdb")
 
     return expression
 
 
-def show_keys(
-    expression: exp.Expression,
-    current_database: str | None = None,
-    *,
-    kind: Literal["PRIMARY", "UNIQUE", "FOREIGN"],
-) -> exp.Expression:
-    """Transform SHOW <kind> KEYS to a query against the duckdb_constraints meta-table.
+# snowflake SHOW ... KEYS to duckdb constraint kind
+_SHOW_KEYS_KINDS: dict[str, Literal["PRIMARY", "UNIQUE", "FOREIGN"]] = {
+    "PRIMARY KEYS": "PRIMARY",
+    "UNIQUE KEYS": "UNIQUE",
+    "IMPORTED KEYS": "FOREIGN",
+}
+
+
+def show_keys(expression: exp.Expression, current_database: str | None = None) -> exp.Expression:
+    """Transform SHOW PRIMARY/UNIQUE/IMPORTED KEYS to a query against the duckdb_constraints meta-table.
 
     https://docs.snowflake.com/en/sql-reference/sql/show-primary-keys
     """
-    snowflake_kind = kind
-    if kind == "FOREIGN":
-        snowflake_kind = "IMPORTED"
-
     if (
         isinstance(expression, exp.Show)
         and isinstance(expression.this, str)
-        and expression.this.upper() == f"{snowflake_kind} KEYS"
+        and (kind := _SHOW_KEYS_KINDS.get(expression.this.upper()))
     ):
         if kind == "FOREIGN":
-            statement = f"""
+            statement = """
                 SELECT
                     to_timestamp(0)::timestamptz as created_on,
 
@@ -1431,7 +1509,6 @@ def show_keys(
                     null as "comment"
                 FROM duckdb_constraints
                 WHERE constraint_type = 'PRIMARY KEY'
-                  AND database_name = '{current_database}'
                   AND table_name NOT LIKE '_fs_%'
                 """
         else:
@@ -1448,10 +1525,12 @@ def show_keys(
                     null as "comment"
                 FROM duckdb_constraints
                 WHERE constraint_type = '{kind} KEY'
-                  AND database_name = '{current_database}'
                   AND table_name NOT LIKE '_fs_%'
                 """
 
+        select = cast(exp.Select, _parse(statement).copy())
+        _and_where(select, "database_name", current_database or "")
+
         scope_kind = expression.args.get("scope_kind")
         if scope_kind:
             table = expression.args["scope"]
@@ -1460,18 +1539,50 @@ def show_keys(
                 db = table and table.db
                 schema = table and table.name
                 if db:
-                    statement += f"AND database_name = '{db}' "
+                    _and_where(select, "database_name", db)
 
                 if schema:
-                    statement += f"AND schema_name = '{schema}' "
+                    _and_where(select, "schema_name", schema)
             elif scope_kind == "TABLE":
                 if not table:
                     raise ValueError(f"SHOW PRIMARY KEYS with {scope_kind} scope requires a table")
 
-                statement += f"AND table_name = '{table.name}' "
+                _and_where(select, "table_name", table.name)
             else:
                 raise NotImplementedError(f"SHOW PRIMARY KEYS with {scope_kind} not yet supported")
-        return sqlglot.parse_one(statement)
+        return select
+    return expression
+
+
+# the transform for each kind of SHOW
+_SHOW_TRANSFORMS: dict[str, Callable[[exp.Show, str | None], exp.Expression]] = {
+    "OBJECTS": show_objects_tables,
+    "TABLES": show_objects_tables,
+    "SCHEMAS": show_schemas,
+    "PRIMARY KEYS": show_keys,
+    "UNIQUE KEYS": show_keys,
+    "IMPORTED KEYS": show_keys,
+    "USERS": show_users,
+}
+
+
+def show(expression: exp.Expression, current_database: str | None = None) -> exp.Expression:
+    """Transform SHOW statements, dispatching to the transform for the kind of SHOW.
+
+    Args:
+        expression (exp.Expression): the expression that will be transformed.
+        current_database (str | None): the current database, used when the SHOW has no database scope.
+
+    Returns:
+        exp.Expression: The transformed expression, or expression as-is if it isn't a supported SHOW.
+    """
+    if (
+        isinstance(expression, exp.Show)
+        and isinstance(expression.this, str)
+        and (transform := _SHOW_TRANSFORMS.get(expression.this.upper()))
+    ):
+        return transform(expression, current_database)
+
     return expression
 
 
@@ -1481,7 +1592,7 @@ def update_variables(
 ) -> exp.Expression:
     if Variables.is_variable_modifier(expression):
         variables.update_variables(expression)
-        return SUCCESS_NOP  # Nothing further to do if its a SET/UNSET operation.
+        return SUCCESS_NOP.copy()  # Nothing further to do if its a SET/UNSET operation.
     return expression
 
 
@@ -1506,25 +1617,17 @@ def sha256(expression: exp.Expression) -> exp.Expression:
         exp.Expression: The transformed expression.
     """
 
-    if isinstance(expression, exp.SHA2) and expression.args.get("length", exp.Literal.number(256)).this == "256":
+    if isinstance(expression, exp.SHA2) and (not (length := expression.args.get("length")) or length.this == "256"):
         return SHA256(this=expression.this)
     elif (
         isinstance(expression, exp.Anonymous)
-        and expression.this.upper() == "SHA2_HEX"
-        and (
-            len(expression.expressions) == 1
-            or (len(expression.expressions) == 2 and expression.expressions[1].this == "256")
-        )
-    ):
-        return SHA256(this=expression.expressions[0])
-    elif (
-        isinstance(expression, exp.Anonymous)
-        and expression.this.upper() == "SHA2_BINARY"
+        and (name := expression.this.upper()) in ("SHA2_HEX", "SHA2_BINARY")
         and (
             len(expression.expressions) == 1
             or (len(expression.expressions) == 2 and expression.expressions[1].this == "256")
         )
     ):
-        return exp.Unhex(this=SHA256(this=expression.expressions[0]))
+        sha = SHA256(this=expression.expressions[0])
+        return sha if name == "SHA2_HEX" else exp.Unhex(this=sha)
 
     return expression
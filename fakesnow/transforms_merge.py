@@ -1,4 +1,8 @@
-import sqlglot
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
 from sqlglot import exp
 
 from fakesnow import checks
@@ -10,10 +14,42 @@ def merge(merge_expr: exp.Expression) -> list[exp.Expression]:
     if not isinstance(merge_expr, exp.Merge):
         return [merge_expr]
 
-    return [_create_merge_candidates(merge_expr), *_mutations(merge_expr), _counts(merge_expr)]
+    whens = [_when(w_idx, w) for w_idx, w in enumerate(merge_expr.expressions)]
+
+    return [_create_merge_candidates(merge_expr, whens), *_mutations(merge_expr, whens), _counts(whens)]
+
+
+@dataclass
+class _When:
+    """A WHEN clause of the merge, classified by the operation it performs."""
+
+    idx: int
+    kind: Literal["update", "delete", "insert"]
+    then: exp.Expression
+    condition: exp.Expression | None
+
 
+def _when(w_idx: int, w: exp.Expression) -> _When:
+    assert isinstance(w, exp.When), f"Expected When expression, got {w}"
 
-def _create_merge_candidates(merge_expr: exp.Merge) -> exp.Expression:
+    then = w.args.get("then")
+    condition = w.args.get("condition")
+
+    if w.args.get("matched"):
+        # matchedClause see https://docs.snowflake.com/en/sql-reference/sql/merge#matchedclause-for-updates-or-deletes
+        if isinstance(then, exp.Update):
+            return _When(w_idx, "update", then, condition)
+        elif isinstance(then, exp.Var) and then.args.get("this") == "DELETE":
+            return _When(w_idx, "delete", then, condition)
+        else:
+            raise AssertionError(f"Expected 'Update' or 'Delete', got {then}")
+    else:
+        # notMatchedClause see https://docs.snowflake.com/en/sql-reference/sql/merge#notmatchedclause-for-inserts
+        assert isinstance(then, exp.Insert), f"Expected 'Insert', got {then}"
+        return _When(w_idx, "insert", then, condition)
+
+
+def _create_merge_candidates(merge_expr: exp.Merge, whens: list[_When]) -> exp.Expression:
     """
     Given a merge statement, produce a temporary table that joins together the target and source tables.
     The merge_op column identifies which merge clause applies to the row.
@@ -28,138 +64,123 @@ def _create_merge_candidates(merge_expr: exp.Merge) -> exp.Expression:
     join_expr = merge_expr.args.get("on")
     assert isinstance(join_expr, exp.Binary)
 
-    case_when_clauses: list[str] = []
-    values: set[str] = set()
+    ifs: list[exp.If] = []
+    # columns keyed by their sql, to dedupe and sort them
+    values: dict[str, exp.Column] = {}
 
     # extract keys that reference the source table from the join expression
     # so they can be used by the mutation statements for joining
     # will include the source table identifier
     values.update(
-        map(
-            str,
-            {
-                c
-                for c in join_expr.find_all(exp.Column)
-                if (table := c.args.get("table"))
-                and isinstance(table, exp.Identifier)
-                and checks.equal(table, source_id)
-            },
-        )
+        (str(c), c)
+        for c in join_expr.find_all(exp.Column)
+        if (table := c.args.get("table")) and isinstance(table, exp.Identifier) and checks.equal(table, source_id)
     )
 
     # Iterate through the WHEN clauses to build up the CASE WHEN clauses
-    for w_idx, w in enumerate(merge_expr.expressions):
-        assert isinstance(w, exp.When), f"Expected When expression, got {w}"
-
-        predicate = join_expr.copy()
-        matched = w.args.get("matched")
-        then = w.args.get("then")
-        condition = w.args.get("condition")
-
-        if matched:
-            # matchedClause see https://docs.snowflake.com/en/sql-reference/sql/merge#matchedclause-for-updates-or-deletes
-            if condition:
-                # Combine the top level ON expression with the AND condition
-                # from this specific WHEN into a subquery, we use to target rows.
-                # Eg. MERGE INTO t1 USING t2 ON t1.t1Key = t2.t2Key
-                #       WHEN MATCHED AND t2.marked = 1 THEN DELETE
-                predicate = exp.And(this=predicate, expression=condition)
-
-            if isinstance(then, exp.Update):
-                case_when_clauses.append(f"WHEN {predicate} THEN {w_idx}")
-                values.update([str(c.expression) for c in then.expressions if isinstance(c.expression, exp.Column)])
-            elif isinstance(then, exp.Var) and then.args.get("this") == "DELETE":
-                case_when_clauses.append(f"WHEN {predicate} THEN {w_idx}")
-            else:
-                raise AssertionError(f"Expected 'Update' or 'Delete', got {then}")
+    for w in whens:
+        if w.kind == "insert":
+            values.update((str(c), c) for c in w.then.expression.expressions if isinstance(c, exp.Column))
+            predicate = exp.column("rowid", table=target_tbl.alias_or_name).is_(exp.null())
         else:
-            # notMatchedClause see https://docs.snowflake.com/en/sql-reference/sql/merge#notmatchedclause-for-inserts
-            assert isinstance(then, exp.Insert), f"Expected 'Insert', got {then}"
-            insert_values = then.expression.expressions
-            values.update([str(c) for c in insert_values if isinstance(c, exp.Column)])
-            predicate = f"AND {condition}" if condition else ""
-            case_when_clauses.append(f"WHEN {target_tbl}.rowid is NULL {predicate} THEN {w_idx}")
-
-    sql = f"""
-    CREATE OR REPLACE TEMPORARY TABLE merge_candidates AS
-    SELECT
-        {', '.join(sorted(values))},
-        CASE
-            {' '.join(case_when_clauses)}
-            ELSE NULL
-        END AS MERGE_OP
-    FROM {target_tbl}
-    FULL OUTER JOIN {source} ON {join_expr.sql()}
-    WHERE MERGE_OP IS NOT NULL
-    """
+            predicate = join_expr.copy()
+            if w.kind == "update":
+                set_values = (c.expression for c in w.then.expressions)
+                values.update((str(v), v) for v in set_values if isinstance(v, exp.Column))
+
+        if w.condition:
+            # Combine the predicate with the AND condition from this specific WHEN
+            # Eg. MERGE INTO t1 USING t2 ON t1.t1Key = t2.t2Key
+            #       WHEN MATCHED AND t2.marked = 1 THEN DELETE
+            predicate = exp.and_(predicate, w.condition.copy(), copy=False)
+
+        ifs.append(exp.If(this=predicate, true=exp.Literal.number(w.idx)))
+
+    select = (
+        exp.select(
+            *(values[v].copy() for v in sorted(values)),
+            exp.alias_(exp.Case(ifs=ifs, default=exp.null()), "MERGE_OP"),
+        )
+        .from_(target_tbl.copy())
+        .join(source.copy(), on=join_expr.copy(), join_type="FULL OUTER")
+        .where(exp.column("MERGE_OP").is_(exp.null()).not_())
+    )
 
-    return sqlglot.parse_one(sql)
+    return exp.Create(
+        this=exp.to_table("merge_candidates"),
+        kind="TABLE",
+        replace=True,
+        expression=select,
+        properties=exp.Properties(expressions=[exp.TemporaryProperty()]),
+    )
 
 
-def _mutations(merge_expr: exp.Merge) -> list[exp.Expression]:
+def _mutations(merge_expr: exp.Merge, whens: list[_When]) -> list[exp.Expression]:
     """
     Given a merge statement, produce a list of delete, update and insert statements that use the
     merge_candidates and source table to update the target target.
     """
     target_tbl = merge_expr.this
     source = merge_expr.args.get("using")
-    source_tbl = source.alias if isinstance(source, exp.Subquery) else source
+    assert isinstance(source, exp.Expression)
+    source_alias = source.alias_or_name
     join_expr = merge_expr.args.get("on")
+    assert isinstance(join_expr, exp.Expression)
 
     statements: list[exp.Expression] = []
 
     # Iterate through the WHEN clauses to generate delete/update/insert statements
-    for w_idx, w in enumerate(merge_expr.expressions):
-        assert isinstance(w, exp.When), f"Expected When expression, got {w}"
-
-        matched = w.args.get("matched")
-        then = w.args.get("then")
-
-        if matched:
-            if isinstance(then, exp.Var) and then.args.get("this") == "DELETE":
-                delete_sql = f"""
-                    DELETE FROM {target_tbl}
-                    USING merge_candidates AS {source_tbl}
-                    WHERE {join_expr}
-                    AND {source_tbl}.merge_op = {w_idx}
-                """
-                statements.append(sqlglot.parse_one(delete_sql))
-            elif isinstance(then, exp.Update):
-                # when the update statement has a table alias, duckdb doesn't support the alias in the set
-                # column name, so we use e.this.this to get just the column name without its table prefix
-                set_clauses = ", ".join(
-                    [f"{e.this.this} = {e.expression.sql()}" for e in then.args.get("expressions", [])]
+    for w in whens:
+        then = w.then
+        # merge_candidates rows this WHEN clause applies to
+        merge_op = exp.column("merge_op", table=source_alias).eq(exp.Literal.number(w.idx))
+
+        if w.kind == "delete":
+            statements.append(
+                exp.Delete(
+                    this=target_tbl.copy(),
+                    using=_merge_candidates_as(source_alias),
+                    where=exp.Where(this=exp.and_(join_expr.copy(), merge_op, copy=False)),
+                )
+            )
+        elif w.kind == "update":
+            # when the update statement has a table alias, duckdb doesn't support the alias in the set
+            # column name, so we use e.this.this to get just the column name without its table prefix
+            statements.append(
+                exp.Update(
+                    this=target_tbl.copy(),
+                    expressions=[
+                        exp.column(e.this.this.copy()).eq(e.expression.copy()) for e in then.args.get("expressions", [])
+                    ],
+                    **{"from": exp.From(this=_merge_candidates_as(source_alias))},
+                    where=exp.Where(this=exp.and_(join_expr.copy(), merge_op, copy=False)),
                 )
-                update_sql = f"""
-                    UPDATE {target_tbl}
-                    SET {set_clauses}
-                    FROM merge_candidates AS {source_tbl}
-                    WHERE {join_expr}
-                    AND {source_tbl}.merge_op = {w_idx}
-                """
-                statements.append(sqlglot.parse_one(update_sql))
-            else:
-                raise AssertionError(f"Expected 'Update' or 'Delete', got {then}")
+            )
         else:
-            assert isinstance(then, exp.Insert), f"Expected 'Insert', got {then}"
-            cols = [str(c) for c in then.this.expressions] if then.this else []
-            columns = f"({', '.join(cols)})" if cols else ""
-            values = ", ".join(map(str, then.expression.expressions))
-            insert_sql = f"""
-                INSERT INTO {target_tbl} {columns}
-                SELECT {values}
-                FROM merge_candidates AS {source_tbl}
-                WHERE {source_tbl}.merge_op = {w_idx}
-            """
-            statements.append(sqlglot.parse_one(insert_sql))
+            cols = [c.copy() for c in then.this.expressions] if then.this else []
+            select = (
+                exp.select(*(v.copy() for v in then.expression.expressions))
+                .from_(_merge_candidates_as(source_alias))
+                .where(merge_op)
+            )
+            statements.append(
+                exp.Insert(
+                    this=exp.Schema(this=target_tbl.copy(), expressions=cols) if cols else target_tbl.copy(),
+                    expression=select,
+                )
+            )
 
     return statements
 
 
-def _counts(merge_expr: exp.Merge) -> exp.Expression:
+def _merge_candidates_as(alias: str) -> exp.Table:
+    return exp.Table(this=exp.to_identifier("merge_candidates"), alias=exp.TableAlias(this=exp.to_identifier(alias)))
+
+
+def _counts(whens: list[_When]) -> exp.Expression:
     """
-    Given a merge statement, derive the a SQL statement which produces the following columns using the merge_candidates
-    table:
+    Given the WHEN clauses of a merge statement, derive the a SQL statement which produces the following columns
+    using the merge_candidates table:
 
     - "number of rows inserted"
     - "number of rows updated"
@@ -170,34 +191,21 @@ def _counts(merge_expr: exp.Merge) -> exp.Expression:
     """
 
     # Initialize dictionaries to store operation types and their corresponding indices
-    operations = {"inserted": [], "updated": [], "deleted": []}
-
-    # Iterate through the WHEN clauses to categorize operations
-    for w_idx, w in enumerate(merge_expr.expressions):
-        assert isinstance(w, exp.When), f"Expected When expression, got {w}"
-
-        matched = w.args.get("matched")
-        then = w.args.get("then")
-
-        if matched:
-            if isinstance(then, exp.Update):
-                operations["updated"].append(w_idx)
-            elif isinstance(then, exp.Var) and then.args.get("this") == "DELETE":
-                operations["deleted"].append(w_idx)
-            else:
-                raise AssertionError(f"Expected 'Update' or 'Delete', got {then}")
-        else:
-            assert isinstance(then, exp.Insert), f"Expected 'Insert', got {then}"
-            operations["inserted"].append(w_idx)
+    operations: dict[str, list[int]] = {"inserted": [], "updated": [], "deleted": []}
+    past_tense = {"insert": "inserted", "update": "updated", "delete": "deleted"}
+
+    # Categorize the WHEN clauses by operation
+    for w in whens:
+        operations[past_tense[w.kind]].append(w.idx)
 
     count_statements = [
-        f"""COUNT_IF(merge_op in ({','.join(map(str, indices))})) as \"number of rows {op}\""""
+        exp.alias_(
+            exp.CountIf(this=exp.column("merge_op").isin(*map(exp.Literal.number, indices))),
+            f"number of rows {op}",
+            quoted=True,
+        )
         for op, indices in operations.items()
         if indices
     ]
-    sql = f"""
-    SELECT {', '.join(count_statements)}
-    FROM merge_candidates
-    """
 
-    return sqlglot.parse_one(sql)
+    return exp.select(*count_statements).from_("merge_candidates")
@@ -1229,7 +1229,7 @@ def test_values(conn: snowflake.connector.SnowflakeConnection):
 
 def test_json_extract_cast_as_varchar(dcur: snowflake.connector.cursor.DictCursor):
     dcur.execute("CREATE TABLE example (j VARIANT)")
-    dcur.execute("""INSERT INTO example SELECT PARSE_JSON('{"str": "100", "num" : 200}')""")
+    dcur.execute("""INSERT INTO example SELECT PARSE_JSON('{"str": "100", "num" : 200, "fruit": "banana"}')""")
 
     dcur.execute("SELECT j:str::varchar as j_str_varchar, j:num::varchar as j_num_varchar FROM example")
     assert dcur.fetchall() == [{"J_STR_VARCHAR": "100", "J_NUM_VARCHAR": "200"}]
@@ -1237,6 +1237,10 @@ def test_json_extract_cast_as_varchar(dcur: snowflake.connector.cursor.DictCurso
     dcur.execute("SELECT j:str::number as j_str_number, j:num::number as j_num_number FROM example")
     assert dcur.fetchall() == [{"J_STR_NUMBER": 100, "J_NUM_NUMBER": 200}]
 
+    # bracket access is unquoted too
+    dcur.execute("SELECT j['fruit']::varchar as j_fruit_varchar, upper(j['fruit']) as j_fruit_upper FROM example")
+    assert dcur.fetchall() == [{"J_FRUIT_VARCHAR": "banana", "J_FRUIT_UPPER": "BANANA"}]
+
 
 def test_truncate(dcur: snowflake.connector.cursor.DictCursor):
     dcur.execute("CREATE TABLE example (i INTEGER)")
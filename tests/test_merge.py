@@ -123,7 +123,7 @@ def test_transform_merge_complex_join_keys() -> None:
             CREATE OR REPLACE TEMPORARY TABLE merge_candidates AS
             SELECT t2.id, t2.name,
                 CASE
-                    WHEN t1.id = t2.id AND t1.name = t2.name AND t1.status = 'old' THEN 0
+                    WHEN (t1.id = t2.id AND t1.name = t2.name) AND t1.status = 'old' THEN 0
                     WHEN t1.rowid IS NULL THEN 1
                     ELSE NULL
                 END AS MERGE_OP
@@ -134,7 +134,7 @@ def test_transform_merge_complex_join_keys() -> None:
         strip("""
             DELETE FROM t1
             USING merge_candidates AS t2
-            WHERE t1.id = t2.id AND t1.name = t2.name
+            WHERE (t1.id = t2.id AND t1.name = t2.name)
             AND t2.merge_op = 0"""),
         strip("""
             INSERT INTO t1
@@ -183,7 +183,7 @@ def test_transform_merge_source_subquery() -> None:
             UPDATE LINE AS tgt
             SET ACTIVE_STATUS = src.ACTIVE_STATUS, END_DATE = NULL
             FROM merge_candidates AS src
-            WHERE tgt.BATCH_NUMBER = src.BATCH_NUMBER AND tgt.ID = src.ID
+            WHERE (tgt.BATCH_NUMBER = src.BATCH_NUMBER AND tgt.ID = src.ID)
             AND src.merge_op = 0"""),
         strip("""
             SELECT
@@ -192,6 +192,50 @@ def test_transform_merge_source_subquery() -> None:
     ]
 
 
+def test_transform_merge_or_join() -> None:
+    # the OR'd join must be parenthesised so the WHEN and merge_op conditions apply to all of it
+    assert [
+        e.sql(dialect="duckdb")
+        for e in transforms.merge(
+            sqlglot.parse_one(
+                """
+                MERGE INTO t1 USING t2 ON t1.k = t2.k OR t1.j = t2.j
+                    WHEN MATCHED AND t2.v = 'x' THEN UPDATE SET t1.v = t2.v
+                    WHEN MATCHED THEN DELETE
+                """
+            )
+        )
+    ] == [
+        strip("""
+            CREATE OR REPLACE TEMPORARY TABLE merge_candidates AS
+            SELECT t2.j, t2.k, t2.v,
+                CASE
+                    WHEN (t1.k = t2.k OR t1.j = t2.j) AND t2.v = 'x' THEN 0
+                    WHEN t1.k = t2.k OR t1.j = t2.j THEN 1
+                    ELSE NULL
+                END AS MERGE_OP
+                FROM t1
+            FULL OUTER JOIN t2 ON t1.k = t2.k OR t1.j = t2.j
+            WHERE NOT MERGE_OP IS NULL"""),
+        strip("""
+            UPDATE t1
+            SET v = t2.v
+            FROM merge_candidates AS t2
+            WHERE (t1.k = t2.k OR t1.j = t2.j)
+            AND t2.merge_op = 0"""),
+        strip("""
+            DELETE FROM t1
+            USING merge_candidates AS t2
+            WHERE (t1.k = t2.k OR t1.j = t2.j)
+            AND t2.merge_op = 1"""),
+        strip("""
+            SELECT
+              COUNT_IF(merge_op IN (0)) AS "number of rows updated",
+              COUNT_IF(merge_op IN (1)) AS "number of rows deleted"
+            FROM merge_candidates"""),
+    ]
+
+
 # TODO: Also consider nondeterministic config for throwing errors when multiple source criteria match a target row
 # https://docs.snowflake.com/en/sql-reference/sql/merge#nondeterministic-results-for-update-and-delete
 def test_merge(conn: snowflake.connector.SnowflakeConnection):
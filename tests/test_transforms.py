@@ -6,6 +6,7 @@ from sqlglot import exp
 
 from fakesnow.transforms import (
     SUCCESS_NOP,
+    Pipeline,
     _get_to_number_args,
     alias_in_join,
     alter_table_strip_cluster_by,
@@ -41,6 +42,7 @@ from fakesnow.transforms import (
     semi_structured_types,
     set_schema,
     sha256,
+    show,
     show_objects_tables,
     show_schemas,
     split,
@@ -502,6 +504,11 @@ def test_indices_to_object() -> None:
         == "SELECT name -> '$.k' FROM semi"
     )
 
+    assert (
+        sqlglot.parse_one("SELECT name['a.b'] FROM semi").transform(indices_to_json_extract).sql(dialect="duckdb")
+        == """SELECT name -> '$."a.b"' FROM semi"""
+    )
+
 
 def test_integer_precision() -> None:
     assert (
@@ -555,6 +562,13 @@ def test_json_extract_cased_as_varchar() -> None:
         .sql(dialect="duckdb")
         == """SELECT LOWER(JSON('{"fruit":"banana"}') ->> '$.fruit')"""
     )
+    assert (
+        sqlglot.parse_one("""select upper(v['fruit'])""", read="snowflake")
+        .transform(indices_to_json_extract)
+        .transform(json_extract_cased_as_varchar)
+        .sql(dialect="duckdb")
+        == """SELECT UPPER(v ->> '$.fruit')"""
+    )
 
 
 def test_json_extract_cast_as_varchar() -> None:
@@ -578,6 +592,14 @@ def test_json_extract_cast_as_varchar() -> None:
         == """SELECT CAST(JSON('{"count":"9000"}') ->> '$.count' AS DECIMAL(38, 0))"""
     )
 
+    assert (
+        sqlglot.parse_one("""select v['fruit']::varchar""", read="snowflake")
+        .transform(indices_to_json_extract)
+        .transform(json_extract_cast_as_varchar)
+        .sql(dialect="duckdb")
+        == """SELECT CAST(v ->> '$.fruit' AS TEXT)"""
+    )
+
 
 def test_json_extract_precedence() -> None:
     assert (
@@ -613,6 +635,31 @@ def test_object_construct() -> None:
     )
 
 
+def test_pipeline() -> None:
+    e = sqlglot.parse_one("select trim(name::varchar) from table1", read="snowflake")
+
+    def fail(expression: exp.Expression) -> exp.Expression:
+        raise AssertionError("should be skipped")
+
+    transformed = (
+        Pipeline(e)
+        .apply(upper_case_unquoted_identifiers, exp.Identifier)
+        .apply(fail, exp.Show)
+        .apply(fail, "TO_DATE")
+        .apply(trim_cast_varchar, exp.Trim)
+        .expression
+    )
+
+    assert transformed.sql(dialect="duckdb") == "SELECT TRIM(CAST(NAME AS TEXT)) FROM TABLE1"
+    # transforms in place rather than copying
+    assert transformed is e
+
+    e = sqlglot.parse_one("select to_date('2024-01-01'), my_udf(1)", read="snowflake")
+    transformed = Pipeline(e).apply(fail, "MY_FUNC").apply(to_date, "TO_DATE").expression
+
+    assert transformed.sql(dialect="duckdb") == "SELECT CAST('2024-01-01' AS DATE), MY_UDF(1)"
+
+
 def test_random() -> None:
     e = sqlglot.parse_one("select random(420)").transform(random)
 
@@ -662,6 +709,14 @@ def test_semi_structured_types() -> None:
     )
 
 
+def test_show() -> None:
+    e = sqlglot.parse_one("show terse schemas in database db1", read="snowflake")
+    assert e.transform(show) == e.transform(show_schemas)
+
+    e = sqlglot.parse_one("show warehouses", read="snowflake")
+    assert e.transform(show) == e
+
+
 def test_show_objects_tables() -> None:
     assert (
         sqlglot.parse_one("show terse objects in database db1 limit 10", read="snowflake")
@@ -936,6 +991,18 @@ def test_trim_cast_varchar() -> None:
         == "SELECT TRIM(CAST(col AS TEXT)) FROM table1"
     )
 
+    assert (
+        sqlglot.parse_one("SELECT TRIM(' name ')").transform(trim_cast_varchar).sql(dialect="duckdb")
+        == "SELECT TRIM(' name ')"
+    )
+
+    assert (
+        sqlglot.parse_one("SELECT TRIM(col, 'x') FROM table1", read="snowflake")
+        .transform(trim_cast_varchar)
+        .sql(dialect="duckdb")
+        == "SELECT TRIM(CAST(col AS TEXT), 'x') FROM table1"
+    )
+
 
 def test_upper_case_unquoted_identifiers() -> None:
     assert (
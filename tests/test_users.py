@@ -1,3 +1,4 @@
+import pytest
 import snowflake.connector.cursor
 
 
@@ -17,3 +18,8 @@ def test_show_users_with_users(cur: snowflake.connector.cursor.SnowflakeCursor):
     rows = result.fetchall()
     names = [row[0] for row in rows]
     assert names == ["foo", "bar"]
+
+
+def test_create_user_with_properties(cur: snowflake.connector.cursor.SnowflakeCursor):
+    with pytest.raises(NotImplementedError, match="PASSWORD"):
+        cur.execute("CREATE USER foo PASSWORD = 'bar'")